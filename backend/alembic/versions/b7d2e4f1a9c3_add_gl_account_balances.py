@@ -0,0 +1,46 @@
+"""add gl_account_balances running totals
+
+Revision ID: b7d2e4f1a9c3
+Revises: 86c0ba98cfd7
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e4f1a9c3'
+down_revision = '86c0ba98cfd7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('gl_account_balances',
+    sa.Column('gl_account_id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('debit_total', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('credit_total', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.ForeignKeyConstraint(['gl_account_id'], ['gl_accounts.id'], ),
+    sa.PrimaryKeyConstraint('gl_account_id')
+    )
+    op.create_index(op.f('ix_gl_account_balances_company_id'), 'gl_account_balances', ['company_id'], unique=False)
+    
+    # Backfill totals for existing accounts from the ledger
+    op.execute("""
+        INSERT INTO gl_account_balances (gl_account_id, company_id, debit_total, credit_total)
+        SELECT a.id, a.company_id,
+               COALESCE(SUM(t.debit_amount), 0),
+               COALESCE(SUM(t.credit_amount), 0)
+        FROM gl_accounts a
+        LEFT JOIN gl_transactions t ON t.gl_account_id = a.id
+        GROUP BY a.id, a.company_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_gl_account_balances_company_id'), table_name='gl_account_balances')
+    op.drop_table('gl_account_balances')
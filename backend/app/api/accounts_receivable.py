@@ -200,6 +200,7 @@ async def list_ar_transactions(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     is_posted: Optional[bool] = Query(None),
+    reference_number: Optional[str] = Query(None, max_length=50),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     current_user: User = Depends(require_permission(Permissions.AR_VIEW_TRANSACTIONS)),
@@ -214,6 +215,7 @@ async def list_ar_transactions(
         date_from=date_from,
         date_to=date_to,
         is_posted=is_posted,
+        reference_number=reference_number,
         skip=skip,
         limit=limit
     )
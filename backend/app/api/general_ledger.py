@@ -172,6 +172,60 @@ async def create_gl_transaction(
         )
 
 
+@router.post("/transactions/batch", response_model=List[GLTransactionResponse], status_code=status.HTTP_201_CREATED)
+async def create_gl_transactions_batch(
+    transactions: List[GLTransactionCreateRequest],
+    current_user: User = Depends(require_permission(Permissions.GL_JOURNAL_CREATE)),
+    db: Session = Depends(get_db)
+):
+    """Create all lines of a journal entry in one request - REQ-GL-TRANS-CREATE"""
+    
+    if not transactions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one transaction line is required"
+        )
+    
+    # Validate each distinct GL account and accounting period once
+    for account_id in {t.gl_account_id for t in transactions}:
+        if not gl_account_crud.get_account(db, account_id, current_user.company_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="GL Account not found"
+            )
+    
+    for period_id in {t.accounting_period_id for t in transactions}:
+        period = accounting_period_crud.get_period(db, period_id, current_user.company_id)
+        if not period:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Accounting period not found"
+            )
+        if period.is_closed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot create transactions in a closed accounting period"
+            )
+    
+    from app.schemas.core import GLTransactionCreate
+    transactions_create = [
+        GLTransactionCreate(
+            **t.model_dump(),
+            company_id=current_user.company_id,
+            posted_by=current_user.id
+        )
+        for t in transactions
+    ]
+    
+    try:
+        return gl_transaction_crud.create_transactions_bulk(db, transactions_create)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.get("/transactions", response_model=List[GLTransactionResponse])
 async def get_gl_transactions(
     skip: int = Query(0, ge=0),
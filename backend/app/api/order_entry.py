@@ -203,6 +203,7 @@ def get_purchase_orders(
     company_id: Optional[int] = None,
     supplier_id: Optional[int] = None,
     status: Optional[str] = None,
+    reference: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -210,7 +211,7 @@ def get_purchase_orders(
     require_permission(current_user, "order_entry.view")
     return oe_crud.get_purchase_orders(
         db, skip=skip, limit=limit, company_id=company_id,
-        supplier_id=supplier_id, status=status
+        supplier_id=supplier_id, status=status, reference=reference
     )
 
 
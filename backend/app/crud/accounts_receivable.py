@@ -1,5 +1,5 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, case, desc, asc, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, func, case, desc, asc, or_, insert, update
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime, timedelta
 from decimal import Decimal
@@ -166,6 +166,7 @@ class ARTransactionCRUD:
                         date_from: Optional[date] = None,
                         date_to: Optional[date] = None,
                         is_posted: Optional[bool] = None,
+                        reference_number: Optional[str] = None,
                         skip: int = 0, limit: int = 100) -> List[ARTransaction]:
         """Get AR transactions with filtering"""
         query = db.query(ARTransaction).filter(ARTransaction.company_id == company_id)
@@ -180,14 +181,22 @@ class ARTransactionCRUD:
             query = query.filter(ARTransaction.transaction_date <= date_to)
         if is_posted is not None:
             query = query.filter(ARTransaction.is_posted == is_posted)
+        if reference_number:
+            query = query.filter(ARTransaction.reference_number == reference_number)
             
         return query.order_by(desc(ARTransaction.transaction_date), 
                              desc(ARTransaction.created_at)).offset(skip).limit(limit).all()
     
-    def create_transaction(self, db: Session, transaction: ARTransactionCreate) -> ARTransaction:
-        """Create a new AR transaction"""
-        # Calculate net amount
-        net_amount = transaction.gross_amount + (transaction.tax_amount or 0) - (transaction.discount_amount or 0)
+    def create_transaction(self, db: Session, transaction: ARTransactionCreate,
+                          commit: bool = True) -> ARTransaction:
+        """Create a new AR transaction; commit=False only flushes, leaving the caller's transaction open"""
+        # Calculate net amount in Decimal: with commit=False the row is not refreshed,
+        # so these values are what later arithmetic in the same transaction sees
+        net_amount = (
+            Decimal(str(transaction.gross_amount))
+            + Decimal(str(transaction.tax_amount or 0))
+            - Decimal(str(transaction.discount_amount or 0))
+        )
         
         db_transaction = ARTransaction(
             **transaction.model_dump(),
@@ -195,6 +204,9 @@ class ARTransactionCRUD:
             outstanding_amount=net_amount  # Initially all outstanding
         )
         db.add(db_transaction)
+        if not commit:
+            db.flush()
+            return db_transaction
         db.commit()
         db.refresh(db_transaction)
         return db_transaction
@@ -237,29 +249,39 @@ class ARTransactionCRUD:
         return db_transaction
     
     def post_transaction(self, db: Session, transaction_id: int, company_id: int, 
-                        posted_by: int) -> Optional[ARTransaction]:
-        """Post an AR transaction to GL"""
-        db_transaction = self.get_transaction(db, transaction_id, company_id)
+                        posted_by: int, commit: bool = True) -> Optional[ARTransaction]:
+        """Post an AR transaction to GL; commit=False leaves the caller's transaction open"""
+        # Mark as posted with a single UPDATE ... RETURNING; the is_posted guard
+        # makes a second post a no-op instead of a double balance update
+        db_transaction = db.execute(
+            update(ARTransaction)
+            .where(and_(
+                ARTransaction.id == transaction_id,
+                ARTransaction.company_id == company_id,
+                ARTransaction.is_posted == False
+            ))
+            .values(is_posted=True, posted_by=posted_by, posted_at=datetime.utcnow())
+            .returning(ARTransaction)
+            .options(selectinload(ARTransaction.transaction_type))
+        ).scalar_one_or_none()
+        
         if not db_transaction:
+            if self.get_transaction(db, transaction_id, company_id):
+                raise ValueError("Transaction already posted")
             return None
         
-        if db_transaction.is_posted:
-            raise ValueError("Transaction already posted")
-        
-        # Mark as posted
-        db_transaction.is_posted = True
-        db_transaction.posted_by = posted_by
-        db_transaction.posted_at = datetime.utcnow()
-        
-        # Update customer balance
-        customer_crud.update_customer_balance(
-            db, db_transaction.customer_id, company_id, 
-            Decimal(str(db_transaction.net_amount)), 
-            increase=(db_transaction.transaction_type.affects_balance == "DEBIT")
+        # Update customer balance in the same transaction, signed by the type's balance effect
+        # (the type is loaded alongside the RETURNING row, so it is never stale)
+        affects_balance = db_transaction.transaction_type.affects_balance
+        amount = db_transaction.net_amount if affects_balance == "DEBIT" else -db_transaction.net_amount
+        db.execute(
+            update(Customer)
+            .where(and_(Customer.id == db_transaction.customer_id, Customer.company_id == company_id))
+            .values(current_balance=Customer.current_balance + amount)
         )
         
-        db.commit()
-        db.refresh(db_transaction)
+        if commit:
+            db.commit()
         return db_transaction
     
     def get_outstanding_invoices(self, db: Session, company_id: int, 
@@ -288,13 +310,8 @@ class ARAllocationCRUD:
     """CRUD operations for AR Allocation model - REQ-AR-ALLOC-*"""
     
     def create_allocation(self, db: Session, allocation: ARAllocationCreate, 
-                         posted_by: int) -> ARAllocation:
-        """Create a new AR allocation"""
-        db_allocation = ARAllocation(
-            **allocation.model_dump(),
-            posted_by=posted_by
-        )
-        
+                         posted_by: int, commit: bool = True) -> ARAllocation:
+        """Create a new AR allocation; commit=False only flushes, leaving the caller's transaction open"""
         # Update outstanding amounts
         payment = db.query(ARTransaction).filter(ARTransaction.id == allocation.transaction_id).first()
         invoice = db.query(ARTransaction).filter(ARTransaction.id == allocation.allocated_to_id).first()
@@ -306,9 +323,19 @@ class ARAllocationCRUD:
         payment.outstanding_amount -= Decimal(str(allocation.allocated_amount))
         invoice.outstanding_amount -= Decimal(str(allocation.allocated_amount))
         
-        db.add(db_allocation)
-        db.commit()
-        db.refresh(db_allocation)
+        # Flush the outstanding amounts explicitly: autoflush may be off, and
+        # commit=False callers expect them written when this returns
+        db.flush()
+        
+        # Single-row INSERT ... RETURNING hands back id and server defaults in the same round-trip
+        db_allocation = db.scalars(
+            insert(ARAllocation)
+            .values(**allocation.model_dump(), posted_by=posted_by)
+            .returning(ARAllocation)
+        ).one()
+        
+        if commit:
+            db.commit()
         return db_allocation
     
     def get_allocations(self, db: Session, company_id: int, 
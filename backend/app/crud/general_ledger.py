@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, case
-from typing import List, Optional
+from sqlalchemy import and_, func, case, exists, insert, literal, select
+from typing import Dict, List, Optional
 from datetime import date
-from app.models.core import GLAccount, GLTransaction, AccountingPeriod
+from decimal import Decimal
+from app.models.core import GLAccount, GLTransaction, GLAccountBalance, AccountingPeriod
 from app.schemas.core import (
     GLAccountCreate, GLAccountUpdate,
     GLTransactionCreate, GLTransactionUpdate,
@@ -10,6 +11,10 @@ from app.schemas.core import (
 )
 
 
+class ClosedPeriodError(ValueError):
+    """Raised when posting into a closed accounting period"""
+
+
 class GLAccountCRUD:
     """CRUD operations for General Ledger Accounts"""
     
@@ -37,10 +42,80 @@ class GLAccountCRUD:
             
         return query.order_by(GLAccount.account_code).offset(skip).limit(limit).all()
     
-    def create_account(self, db: Session, account: GLAccountCreate) -> GLAccount:
-        """Create a new GL account"""
+    def get_balance(self, db: Session, account_id: int, company_id: int) -> Decimal:
+        """Get the net (debit - credit) balance of a GL account, aggregated in SQL"""
+        return db.query(
+            func.coalesce(func.sum(GLTransaction.debit_amount) - func.sum(GLTransaction.credit_amount), 0)
+        ).filter(
+            and_(GLTransaction.gl_account_id == account_id, GLTransaction.company_id == company_id)
+        ).scalar()
+    
+    def get_cached_balance(self, db: Session, account_id: int, company_id: int) -> Decimal:
+        """Get the net (debit - credit) balance of a GL account from its running totals row"""
+        totals = db.query(GLAccountBalance.debit_total, GLAccountBalance.credit_total).filter(
+            and_(GLAccountBalance.gl_account_id == account_id, GLAccountBalance.company_id == company_id)
+        ).first()
+        if totals is None:
+            # Seed the missing totals row without committing; the caller owns the transaction
+            return self.recompute_balance(db, account_id, company_id, commit=False)
+        return totals.debit_total - totals.credit_total
+    
+    def apply_to_balance(self, db: Session, account_id: int, company_id: int,
+                         debit_amount, credit_amount) -> None:
+        """Add posted amounts to a GL account's running totals; the caller flushes the ledger rows and commits"""
+        updated = db.query(GLAccountBalance).filter(
+            and_(GLAccountBalance.gl_account_id == account_id, GLAccountBalance.company_id == company_id)
+        ).update({
+            GLAccountBalance.debit_total: GLAccountBalance.debit_total + Decimal(str(debit_amount or 0)),
+            GLAccountBalance.credit_total: GLAccountBalance.credit_total + Decimal(str(credit_amount or 0))
+        }, synchronize_session=False)
+        
+        if not updated:
+            # No totals row yet (account created outside create_account) - seed it from the ledger
+            self.recompute_balance(db, account_id, company_id, commit=False)
+    
+    def recompute_balance(self, db: Session, account_id: int, company_id: int,
+                          commit: bool = True) -> Decimal:
+        """Rebuild a GL account's running totals from its transactions, for reconciliation and audits"""
+        if not self.get_account(db, account_id, company_id):
+            return Decimal("0.00")
+        
+        debit_total, credit_total = db.query(
+            func.coalesce(func.sum(GLTransaction.debit_amount), 0),
+            func.coalesce(func.sum(GLTransaction.credit_amount), 0)
+        ).filter(
+            and_(GLTransaction.gl_account_id == account_id, GLTransaction.company_id == company_id)
+        ).one()
+        
+        totals = db.get(GLAccountBalance, account_id)
+        if totals is None:
+            totals = GLAccountBalance(gl_account_id=account_id, company_id=company_id)
+            db.add(totals)
+        totals.debit_total = debit_total
+        totals.credit_total = credit_total
+        
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return Decimal(str(debit_total)) - Decimal(str(credit_total))
+    
+    def create_account(self, db: Session, account: GLAccountCreate, commit: bool = True) -> GLAccount:
+        """Create a new GL account; commit=False only flushes, leaving the caller's transaction open"""
         db_account = GLAccount(**account.model_dump())
         db.add(db_account)
+        db.flush()
+        
+        # Start the running totals at zero alongside the account
+        db.add(GLAccountBalance(
+            gl_account_id=db_account.id,
+            company_id=db_account.company_id,
+            debit_total=0,
+            credit_total=0
+        ))
+        if not commit:
+            db.flush()
+            return db_account
         db.commit()
         db.refresh(db_account)
         return db_account
@@ -75,7 +150,10 @@ class GLAccountCRUD:
             # Soft delete - can't hard delete accounts with transactions
             db_account.is_active = False
         else:
-            # Hard delete if no transactions
+            # Hard delete if no transactions (with its running totals row)
+            db.query(GLAccountBalance).filter(GLAccountBalance.gl_account_id == account_id).delete(
+                synchronize_session=False
+            )
             db.delete(db_account)
             
         db.commit()
@@ -108,19 +186,104 @@ class GLTransactionCRUD:
             
         return query.order_by(GLTransaction.transaction_date.desc(), GLTransaction.id.desc()).offset(skip).limit(limit).all()
     
-    def create_transaction(self, db: Session, transaction: GLTransactionCreate) -> GLTransaction:
-        """Create a new GL transaction"""
-        # Validate that either debit or credit is non-zero, but not both
+    def get_balances(self, db: Session, company_id: int, account_ids: List[int]) -> Dict[int, Decimal]:
+        """Get net (debit - credit) balances for several GL accounts in one grouped query"""
+        rows = db.query(
+            GLTransaction.gl_account_id,
+            func.sum(GLTransaction.debit_amount) - func.sum(GLTransaction.credit_amount)
+        ).filter(
+            and_(GLTransaction.company_id == company_id, GLTransaction.gl_account_id.in_(account_ids))
+        ).group_by(GLTransaction.gl_account_id).all()
+        
+        balances = {account_id: Decimal("0.00") for account_id in account_ids}
+        balances.update({account_id: balance for account_id, balance in rows})
+        return balances
+    
+    def _validate_amounts(self, transaction: GLTransactionCreate) -> None:
+        """Validate that either debit or credit is non-zero, but not both"""
         if (transaction.debit_amount > 0 and transaction.credit_amount > 0) or \
            (transaction.debit_amount == 0 and transaction.credit_amount == 0):
             raise ValueError("Transaction must have either a debit amount or credit amount, but not both")
-            
-        db_transaction = GLTransaction(**transaction.model_dump())
-        db.add(db_transaction)
-        db.commit()
-        db.refresh(db_transaction)
+    
+    def create_transaction(self, db: Session, transaction: GLTransactionCreate,
+                          commit: bool = True) -> GLTransaction:
+        """Create a new GL transaction; commit=False only flushes, leaving the caller's transaction open"""
+        self._validate_amounts(transaction)
+        
+        # INSERT ... SELECT guarded by the period still being open, so the
+        # closed-period check and the write are a single statement
+        values = transaction.model_dump()
+        columns = GLTransaction.__table__.c
+        period_is_closed = exists().where(and_(
+            AccountingPeriod.id == transaction.accounting_period_id,
+            AccountingPeriod.is_closed == True
+        ))
+        db_transaction = db.scalars(
+            insert(GLTransaction)
+            .from_select(
+                list(values),
+                select(*[literal(value, columns[field].type) for field, value in values.items()])
+                .where(~period_is_closed)
+            )
+            .returning(GLTransaction)
+        ).first()
+        
+        if db_transaction is None:
+            raise ClosedPeriodError("Cannot create transactions in a closed accounting period")
+        
+        # Keep the account's running totals atomic with the ledger insert
+        gl_account_crud.apply_to_balance(
+            db, transaction.gl_account_id, transaction.company_id,
+            transaction.debit_amount, transaction.credit_amount
+        )
+        # No refresh: RETURNING already populated the row, and attributes the
+        # commit expires reload on first access
+        if commit:
+            db.commit()
+        else:
+            db.flush()
         return db_transaction
     
+    def create_transactions_bulk(self, db: Session, transactions: List[GLTransactionCreate],
+                                 commit: bool = True) -> List[GLTransaction]:
+        """Create all lines of a journal entry with one batched INSERT and a single commit"""
+        for transaction in transactions:
+            self._validate_amounts(transaction)
+        
+        if not transactions:
+            return []
+        
+        period_ids = {transaction.accounting_period_id for transaction in transactions}
+        if db.query(AccountingPeriod.id).filter(
+            and_(AccountingPeriod.id.in_(period_ids), AccountingPeriod.is_closed == True)
+        ).first():
+            raise ClosedPeriodError("Cannot create transactions in a closed accounting period")
+        
+        # One executemany INSERT ... RETURNING instead of an INSERT + refresh per line;
+        # sort_by_parameter_order returns the rows in the order of the journal lines
+        db_transactions = db.scalars(
+            insert(GLTransaction).returning(GLTransaction, sort_by_parameter_order=True),
+            [transaction.model_dump() for transaction in transactions]
+        ).all()
+        
+        # One running-totals update per touched account, in the same DB transaction
+        totals = {}
+        for transaction in transactions:
+            key = (transaction.gl_account_id, transaction.company_id)
+            debit, credit = totals.get(key, (Decimal("0.00"), Decimal("0.00")))
+            totals[key] = (
+                debit + Decimal(str(transaction.debit_amount or 0)),
+                credit + Decimal(str(transaction.credit_amount or 0))
+            )
+        for (account_id, company_id), (debit, credit) in totals.items():
+            gl_account_crud.apply_to_balance(db, account_id, company_id, debit, credit)
+        
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return db_transactions
+    
     def update_transaction(self, db: Session, transaction_id: int, company_id: int,
                           transaction_update: GLTransactionUpdate) -> Optional[GLTransaction]:
         """Update an existing GL transaction"""
@@ -135,9 +298,21 @@ class GLTransactionCRUD:
         if period and period.is_closed:
             raise ValueError("Cannot modify transactions in a closed accounting period")
             
+        old_debit = db_transaction.debit_amount or 0
+        old_credit = db_transaction.credit_amount or 0
+            
         update_data = transaction_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_transaction, field, value)
+        
+        # Move the account's running totals by the change in amounts
+        if 'debit_amount' in update_data or 'credit_amount' in update_data:
+            db.flush()
+            gl_account_crud.apply_to_balance(
+                db, db_transaction.gl_account_id, company_id,
+                Decimal(str(db_transaction.debit_amount or 0)) - Decimal(str(old_debit)),
+                Decimal(str(db_transaction.credit_amount or 0)) - Decimal(str(old_credit))
+            )
             
         db.commit()
         db.refresh(db_transaction)
@@ -157,6 +332,12 @@ class GLTransactionCRUD:
             raise ValueError("Cannot delete transactions in a closed accounting period")
             
         db.delete(db_transaction)
+        db.flush()
+        gl_account_crud.apply_to_balance(
+            db, db_transaction.gl_account_id, company_id,
+            -Decimal(str(db_transaction.debit_amount or 0)),
+            -Decimal(str(db_transaction.credit_amount or 0))
+        )
         db.commit()
         return True
     
@@ -1,7 +1,8 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, insert, update
 from datetime import date
+from decimal import Decimal
 
 from app.models.core import (
     InventoryItem, InventoryTransactionType, InventoryTransaction,
@@ -12,6 +13,7 @@ from app.schemas.core import (
     InventoryTransactionTypeCreate, InventoryTransactionTypeUpdate,
     InventoryTransactionCreate, InventoryTransactionUpdate
 )
+from app.crud.general_ledger import gl_account_crud
 
 
 class InventoryItemCRUD:
@@ -152,66 +154,95 @@ class InventoryTransactionCRUD:
     """CRUD operations for Inventory Transactions"""
     
     @staticmethod
-    def _create_gl_entries(
-        db: Session,
+    def _gl_entry_rows(
         company_id: int,
         accounting_period_id: int,
         transaction: InventoryTransaction,
         item: InventoryItem,
         transaction_type: InventoryTransactionType,
         posted_by: int
-    ) -> None:
-        """Create GL entries for inventory transactions."""
+    ) -> List[Dict[str, Any]]:
+        """Build the GL entry rows for an inventory transaction."""
         # Determine if this is a stock receipt or issue
         is_receipt = transaction_type.affects_quantity == "INCREASE"
         
-        # Create GL entries based on transaction type
-        gl_entries = []
+        if transaction.source_module != "INV":
+            # Purchases (AP) and sales (AR) post their GL entries from those modules
+            return []
         
-        if transaction.source_module == "INV":
-            # For inventory adjustments
-            gl_entries = [
-                GLTransaction(
-                    company_id=company_id,
-                    accounting_period_id=accounting_period_id,
-                    gl_account_id=item.gl_asset_account_id,
-                    transaction_date=transaction.transaction_date,
-                    reference_number=transaction.reference_number,
-                    description=transaction.description,
-                    debit_amount=transaction.total_cost if is_receipt else 0,
-                    credit_amount=0 if is_receipt else transaction.total_cost,
-                    source_module="INV",
-                    source_document_id=transaction.id,
-                    posted_by=posted_by,
-                    is_posted=True
-                ),
-                GLTransaction(
-                    company_id=company_id,
-                    accounting_period_id=accounting_period_id,
-                    gl_account_id=item.gl_expense_account_id,
-                    transaction_date=transaction.transaction_date,
-                    reference_number=transaction.reference_number,
-                    description=transaction.description,
-                    debit_amount=0 if is_receipt else transaction.total_cost,
-                    credit_amount=transaction.total_cost if is_receipt else 0,
-                    source_module="INV",
-                    source_document_id=transaction.id,
-                    posted_by=posted_by,
-                    is_posted=True
-                )
-            ]
-        elif transaction.source_module == "AP":
-            # For purchases, we don't create GL entries here
-            # They will be created by the AP module
-            pass
-        elif transaction.source_module == "AR":
-            # For sales, we don't create GL entries here
-            # They will be created by the AR module
-            pass
+        # For inventory adjustments: Inventory Asset against the adjustment (COGS) account
+        entry = {
+            "company_id": company_id,
+            "accounting_period_id": accounting_period_id,
+            "transaction_date": transaction.transaction_date,
+            "reference_number": transaction.reference_number,
+            "description": transaction.description,
+            "source_module": "INV",
+            "source_document_id": transaction.id,
+            "posted_by": posted_by
+        }
+        return [
+            dict(
+                entry,
+                gl_account_id=item.gl_asset_account_id,
+                debit_amount=transaction.total_cost if is_receipt else 0,
+                credit_amount=0 if is_receipt else transaction.total_cost
+            ),
+            dict(
+                entry,
+                gl_account_id=item.gl_expense_account_id,
+                debit_amount=0 if is_receipt else transaction.total_cost,
+                credit_amount=transaction.total_cost if is_receipt else 0
+            )
+        ]
+    
+    @staticmethod
+    def _post_gl_entries(db: Session, company_id: int, gl_rows: List[Dict[str, Any]]) -> None:
+        """Write GL entry rows in one INSERT and roll them into the account running totals."""
+        if not gl_rows:
+            return
+        db.execute(insert(GLTransaction), gl_rows)
         
-        # Add GL entries to the session
-        for entry in gl_entries:
-            db.add(entry)
+        totals: Dict[int, List[Decimal]] = {}
+        for row in gl_rows:
+            account_totals = totals.setdefault(row["gl_account_id"], [Decimal("0.00"), Decimal("0.00")])
+            account_totals[0] += Decimal(str(row["debit_amount"] or 0))
+            account_totals[1] += Decimal(str(row["credit_amount"] or 0))
+        for account_id, (debit, credit) in totals.items():
+            gl_account_crud.apply_to_balance(db, account_id, company_id, debit, credit)
+
+    @staticmethod
+    def _apply_to_item(
+        db: Session, obj_in: InventoryTransactionCreate, transaction_type: InventoryTransactionType
+    ) -> InventoryItem:
+        """Apply a transaction's quantity (and receipt cost) to its item in one guarded UPDATE."""
+        # Update quantity based on transaction type
+        quantity_change = Decimal(str(obj_in.quantity))
+        if transaction_type.affects_quantity == "DECREASE":
+            quantity_change = -quantity_change
+        
+        new_quantity = InventoryItem.quantity_on_hand + quantity_change
+        values = {InventoryItem.quantity_on_hand: new_quantity}
+        # Update weighted average cost if it's a stock receipt
+        if transaction_type.affects_quantity == "INCREASE" and quantity_change > 0:
+            values[InventoryItem.cost_price] = (
+                InventoryItem.quantity_on_hand * func.coalesce(InventoryItem.cost_price, 0) + 
+                quantity_change * Decimal(str(obj_in.unit_cost))
+            ) / new_quantity
+        
+        # The stock check runs in the database, so concurrent issues can't
+        # drive the quantity negative
+        item = db.scalars(
+            update(InventoryItem)
+            .where(InventoryItem.id == obj_in.item_id, new_quantity >= 0)
+            .values(values)
+            .returning(InventoryItem)
+        ).first()
+        if not item:
+            if not db.query(InventoryItem.id).filter(InventoryItem.id == obj_in.item_id).first():
+                raise ValueError("Invalid item_id")
+            raise ValueError("Insufficient stock quantity")
+        return item
 
     # Update the create method to include GL entry creation
     @staticmethod
@@ -242,53 +273,101 @@ class InventoryTransactionCRUD:
         )
         db.add(db_obj)
         
-        # Update item quantity and cost
-        item = db.query(InventoryItem).filter(InventoryItem.id == obj_in.item_id).first()
-        if not item:
-            raise ValueError("Invalid item_id")
-            
         transaction_type = db.query(InventoryTransactionType).filter(
             InventoryTransactionType.id == obj_in.transaction_type_id
         ).first()
         if not transaction_type:
             raise ValueError("Invalid transaction_type_id")
         
-        # Update quantity based on transaction type
-        quantity_change = obj_in.quantity
-        if transaction_type.affects_quantity == "DECREASE":
-            quantity_change = -obj_in.quantity
-        
-        new_quantity = item.quantity_on_hand + quantity_change
-        if new_quantity < 0:
-            raise ValueError("Insufficient stock quantity")
-            
-        # Update weighted average cost if it's a stock receipt
-        if transaction_type.affects_quantity == "INCREASE" and quantity_change > 0:
-            new_total_value = (
-                item.quantity_on_hand * item.cost_price + 
-                quantity_change * obj_in.unit_cost
-            )
-            item.cost_price = new_total_value / new_quantity if new_quantity > 0 else obj_in.unit_cost
-            
-        item.quantity_on_hand = new_quantity
-        db.add(item)
+        item = InventoryTransactionCRUD._apply_to_item(db, obj_in, transaction_type)
         
         # Create GL entries if the transaction is posted
         if db_obj.is_posted:
-            InventoryTransactionCRUD._create_gl_entries(
-                db=db,
-                company_id=obj_in.company_id,
-                accounting_period_id=obj_in.accounting_period_id,
-                transaction=db_obj,
-                item=item,
-                transaction_type=transaction_type,
-                posted_by=posted_by
+            db.flush()
+            InventoryTransactionCRUD._post_gl_entries(
+                db, obj_in.company_id, InventoryTransactionCRUD._gl_entry_rows(
+                    company_id=obj_in.company_id,
+                    accounting_period_id=obj_in.accounting_period_id,
+                    transaction=db_obj,
+                    item=item,
+                    transaction_type=transaction_type,
+                    posted_by=posted_by
+                )
             )
         
         db.commit()
         db.refresh(db_obj)
         return db_obj
     
+    @staticmethod
+    def create_bulk(
+        db: Session, *, objs_in: List[InventoryTransactionCreate], posted_by: int
+    ) -> List[InventoryTransaction]:
+        """Create several inventory transactions with one INSERT and a single commit"""
+        if not objs_in:
+            return []
+        
+        transaction_types = {
+            transaction_type.id: transaction_type for transaction_type in db.query(InventoryTransactionType).filter(
+                InventoryTransactionType.id.in_({obj_in.transaction_type_id for obj_in in objs_in})
+            )
+        }
+        
+        # Apply the transactions in order with the same guarded UPDATE as create,
+        # so every intermediate quantity is checked by the database
+        items: Dict[int, InventoryItem] = {}
+        rows = []
+        for obj_in in objs_in:
+            transaction_type = transaction_types.get(obj_in.transaction_type_id)
+            if not transaction_type:
+                raise ValueError("Invalid transaction_type_id")
+            items[obj_in.item_id] = InventoryTransactionCRUD._apply_to_item(db, obj_in, transaction_type)
+            
+            quantity = Decimal(str(obj_in.quantity))
+            unit_cost = Decimal(str(obj_in.unit_cost))
+            rows.append({
+                "company_id": obj_in.company_id,
+                "item_id": obj_in.item_id,
+                "transaction_type_id": obj_in.transaction_type_id,
+                "accounting_period_id": obj_in.accounting_period_id,
+                "transaction_date": obj_in.transaction_date,
+                "reference_number": obj_in.reference_number,
+                "description": obj_in.description,
+                "quantity": quantity,
+                "unit_cost": unit_cost,
+                "total_cost": abs(quantity * unit_cost),
+                "source_module": obj_in.source_module,
+                "source_document_id": obj_in.source_document_id,
+                "posted_by": posted_by,
+                "is_posted": True
+            })
+        
+        # sort_by_parameter_order keeps the RETURNING rows aligned with objs_in
+        db_objs = db.scalars(
+            insert(InventoryTransaction).values(posted_at=func.now())
+            .returning(InventoryTransaction, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        # GL entries for every transaction go out in one INSERT per company
+        gl_rows_by_company: Dict[int, List[Dict[str, Any]]] = {}
+        for db_obj, obj_in in zip(db_objs, objs_in):
+            gl_rows_by_company.setdefault(obj_in.company_id, []).extend(
+                InventoryTransactionCRUD._gl_entry_rows(
+                    company_id=obj_in.company_id,
+                    accounting_period_id=obj_in.accounting_period_id,
+                    transaction=db_obj,
+                    item=items[obj_in.item_id],
+                    transaction_type=transaction_types[obj_in.transaction_type_id],
+                    posted_by=posted_by
+                )
+            )
+        for company_id, gl_rows in gl_rows_by_company.items():
+            InventoryTransactionCRUD._post_gl_entries(db, company_id, gl_rows)
+        
+        db.commit()
+        return db_objs
+    
     @staticmethod
     def get(db: Session, id: int) -> Optional[InventoryTransaction]:
         """Get a transaction by ID"""
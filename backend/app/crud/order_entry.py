@@ -4,7 +4,7 @@ Order Entry CRUD operations - REQ-OE-*
 from typing import List, Optional
 from decimal import Decimal
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, insert, select
 from datetime import date
 
 from app.models.core import (
@@ -91,7 +91,8 @@ def get_sales_orders(
     customer_id: Optional[int] = None,
     status: Optional[str] = None,
     date_from: Optional[date] = None,
-    date_to: Optional[date] = None
+    date_to: Optional[date] = None,
+    reference: Optional[str] = None
 ) -> List[SalesOrder]:
     """Get sales orders with optional filters - REQ-OE-SO-001"""
     query = db.query(SalesOrder).options(
@@ -108,10 +109,17 @@ def get_sales_orders(
         query = query.filter(SalesOrder.order_date >= date_from)
     if date_to:
         query = query.filter(SalesOrder.order_date <= date_to)
+    if reference:
+        query = query.filter(SalesOrder.reference == reference)
     
     return query.order_by(desc(SalesOrder.created_at)).offset(skip).limit(limit).all()
 
 
+def get_sales_order_references(db: Session, company_id: int) -> List[str]:
+    """Get sales order references only - no order rows, customers or line items are loaded"""
+    return list(db.scalars(select(SalesOrder.reference).where(SalesOrder.company_id == company_id)))
+
+
 def get_sales_order(db: Session, company_id: int, sales_order_id: int) -> Optional[SalesOrder]:
     """Get a specific sales order with line items"""
     return db.query(SalesOrder).options(
@@ -149,15 +157,15 @@ def create_sales_order(db: Session, company_id: int, user_id: int, sales_order:
     db.add(db_sales_order)
     db.flush()  # Get the ID
     
-    # Add line items
-    for line_data in sales_order.line_items:
-        line_total = line_data.quantity * line_data.unit_price - line_data.discount_amount
-        db_line = SalesOrderLine(
-            sales_order_id=db_sales_order.id,
-            line_total=line_total,
+    # Add line items - one executemany INSERT rather than a unit-of-work row per line
+    db.execute(insert(SalesOrderLine), [
+        {
+            "sales_order_id": db_sales_order.id,
+            "line_total": line_data.quantity * line_data.unit_price - line_data.discount_amount,
             **line_data.dict()
-        )
-        db.add(db_line)
+        }
+        for line_data in sales_order.line_items
+    ])
     
     # Update document type next number
     document_type.next_number += 1
@@ -190,17 +198,18 @@ def update_sales_order(
         # Remove existing lines
         db.query(SalesOrderLine).filter(SalesOrderLine.sales_order_id == sales_order_id).delete()
         
-        # Add new lines
-        subtotal = Decimal('0.00')
-        for line_data in sales_order_update.line_items:
-            line_total = line_data.quantity * line_data.unit_price - line_data.discount_amount
-            subtotal += line_total
-            db_line = SalesOrderLine(
-                sales_order_id=sales_order_id,
-                line_total=line_total,
+        # Add new lines in a single executemany INSERT
+        line_rows = [
+            {
+                "sales_order_id": sales_order_id,
+                "line_total": line_data.quantity * line_data.unit_price - line_data.discount_amount,
                 **line_data.dict()
-            )
-            db.add(db_line)
+            }
+            for line_data in sales_order_update.line_items
+        ]
+        if line_rows:
+            db.execute(insert(SalesOrderLine), line_rows)
+        subtotal = sum((row["line_total"] for row in line_rows), Decimal('0.00'))
         
         db_sales_order.subtotal = subtotal
         db_sales_order.total_amount = subtotal
@@ -252,7 +261,8 @@ def get_purchase_orders(
     supplier_id: Optional[int] = None,
     status: Optional[str] = None,
     date_from: Optional[date] = None,
-    date_to: Optional[date] = None
+    date_to: Optional[date] = None,
+    reference: Optional[str] = None
 ) -> List[PurchaseOrder]:
     """Get purchase orders with optional filters - REQ-OE-PO-001"""
     query = db.query(PurchaseOrder).options(
@@ -269,10 +279,17 @@ def get_purchase_orders(
         query = query.filter(PurchaseOrder.order_date >= date_from)
     if date_to:
         query = query.filter(PurchaseOrder.order_date <= date_to)
+    if reference:
+        query = query.filter(PurchaseOrder.reference == reference)
     
     return query.order_by(desc(PurchaseOrder.created_at)).offset(skip).limit(limit).all()
 
 
+def get_purchase_order_references(db: Session, company_id: int) -> List[str]:
+    """Get purchase order references only - no order rows, suppliers or line items are loaded"""
+    return list(db.scalars(select(PurchaseOrder.reference).where(PurchaseOrder.company_id == company_id)))
+
+
 def get_purchase_order(db: Session, company_id: int, purchase_order_id: int) -> Optional[PurchaseOrder]:
     """Get a specific purchase order with line items"""
     return db.query(PurchaseOrder).options(
@@ -310,15 +327,15 @@ def create_purchase_order(db: Session, company_id: int, user_id: int, purchase_o
     db.add(db_purchase_order)
     db.flush()  # Get the ID
     
-    # Add line items
-    for line_data in purchase_order.line_items:
-        line_total = line_data.quantity * line_data.unit_price - line_data.discount_amount
-        db_line = PurchaseOrderLine(
-            purchase_order_id=db_purchase_order.id,
-            line_total=line_total,
+    # Add line items - one executemany INSERT rather than a unit-of-work row per line
+    db.execute(insert(PurchaseOrderLine), [
+        {
+            "purchase_order_id": db_purchase_order.id,
+            "line_total": line_data.quantity * line_data.unit_price - line_data.discount_amount,
             **line_data.dict()
-        )
-        db.add(db_line)
+        }
+        for line_data in purchase_order.line_items
+    ])
     
     # Update document type next number
     document_type.next_number += 1
@@ -351,17 +368,18 @@ def update_purchase_order(
         # Remove existing lines
         db.query(PurchaseOrderLine).filter(PurchaseOrderLine.purchase_order_id == purchase_order_id).delete()
         
-        # Add new lines
-        subtotal = Decimal('0.00')
-        for line_data in purchase_order_update.line_items:
-            line_total = line_data.quantity * line_data.unit_price - line_data.discount_amount
-            subtotal += line_total
-            db_line = PurchaseOrderLine(
-                purchase_order_id=purchase_order_id,
-                line_total=line_total,
+        # Add new lines in a single executemany INSERT
+        line_rows = [
+            {
+                "purchase_order_id": purchase_order_id,
+                "line_total": line_data.quantity * line_data.unit_price - line_data.discount_amount,
                 **line_data.dict()
-            )
-            db.add(db_line)
+            }
+            for line_data in purchase_order_update.line_items
+        ]
+        if line_rows:
+            db.execute(insert(PurchaseOrderLine), line_rows)
+        subtotal = sum((row["line_total"] for row in line_rows), Decimal('0.00'))
         
         db_purchase_order.subtotal = subtotal
         db_purchase_order.total_amount = subtotal
@@ -449,17 +467,18 @@ def create_grv(db: Session, company_id: int, user_id: int, grv: GRVCreate) -> Go
     db.add(db_grv)
     db.flush()  # Get the ID
     
-    # Add line items and update purchase order line quantities
-    for line_data in grv.line_items:
-        line_total = line_data.quantity_received * line_data.unit_price
-        db_line = GRVLine(
-            grv_id=db_grv.id,
-            line_total=line_total,
+    # Add line items in one executemany INSERT
+    db.execute(insert(GRVLine), [
+        {
+            "grv_id": db_grv.id,
+            "line_total": line_data.quantity_received * line_data.unit_price,
             **line_data.dict()
-        )
-        db.add(db_line)
-        
-        # Update purchase order line received quantity
+        }
+        for line_data in grv.line_items
+    ])
+    
+    # Update purchase order line received quantities
+    for line_data in grv.line_items:
         po_line = db.query(PurchaseOrderLine).filter(
             PurchaseOrderLine.id == line_data.purchase_order_line_id
         ).first()
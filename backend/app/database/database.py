@@ -3,11 +3,21 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
+# psycopg2 fast-execution helpers: executemany writes (bulk GL and inventory
+# postings) go out as batched VALUES pages instead of a round-trip per row
+engine_options = {}
+if settings.database_url.startswith("postgresql"):
+    engine_options = {
+        "executemany_mode": "values_plus_batch",
+        "executemany_values_page_size": 1000,
+    }
+
 # Create the SQLAlchemy engine
 engine = create_engine(
     settings.database_url,
     echo=settings.debug,  # Log SQL queries in debug mode
     pool_pre_ping=True,   # Verify connections before use
+    **engine_options
 )
 
 # Create SessionLocal class
@@ -1,7 +1,7 @@
 # Import all models here for easy access
 from app.database.database import Base
 from .core import (
-    Company, User, Role, UserRole, AccountingPeriod, GLAccount, GLTransaction,
+    Company, User, Role, UserRole, AccountingPeriod, GLAccount, GLTransaction, GLAccountBalance,
     Customer, ARTransactionType, ARTransaction, ARAllocation, AgeingPeriod,
     Supplier, APTransactionType, APTransaction,
     InventoryItem, InventoryTransactionType, InventoryTransaction,
@@ -18,6 +18,7 @@ __all__ = [
     "AccountingPeriod",
     "GLAccount",
     "GLTransaction",
+    "GLAccountBalance",
     "Customer",
     "ARTransactionType", 
     "ARTransaction",
@@ -186,6 +186,20 @@ class GLTransaction(Base):
     posted_by_user = relationship("User")
 
 
+class GLAccountBalance(Base):
+    """Running debit/credit totals per GL account, maintained on posting - REQ-GL-TRANS-*"""
+    __tablename__ = "gl_account_balances"
+    
+    gl_account_id = Column(Integer, ForeignKey("gl_accounts.id"), primary_key=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    debit_total = Column(DECIMAL(15, 2), nullable=False, default=0.00)
+    credit_total = Column(DECIMAL(15, 2), nullable=False, default=0.00)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    gl_account = relationship("GLAccount")
+
+
 # ================================
 # ACCOUNTS RECEIVABLE MODELS (REQ-AR-*)
 # ================================
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional, List, Dict, Any
+from pydantic import AfterValidator, BaseModel, EmailStr, Field, PlainSerializer, field_validator
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime, date
+from decimal import Decimal, ROUND_HALF_UP
 
 
 # User Schemas
@@ -197,14 +198,24 @@ class GLAccountResponse(GLAccountBase):
 
 
 # General Ledger Transaction Schemas
+# Money amount for the DECIMAL(15, 2) GL amount columns: validated as Decimal and
+# rounded to cents as the column would store it, but still sent as a JSON number
+GLAmount = Annotated[
+    Decimal,
+    Field(ge=0),
+    AfterValidator(lambda amount: amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
+
+
 class GLTransactionBase(BaseModel):
     accounting_period_id: int
     gl_account_id: int
     transaction_date: date
     reference_number: Optional[str] = Field(None, max_length=50)
     description: str = Field(..., min_length=1)
-    debit_amount: Optional[float] = Field(default=0.00, ge=0)
-    credit_amount: Optional[float] = Field(default=0.00, ge=0)
+    debit_amount: Optional[GLAmount] = Field(default=Decimal('0.00'))
+    credit_amount: Optional[GLAmount] = Field(default=Decimal('0.00'))
     source_module: Optional[str] = Field(None, max_length=50)
     source_document_id: Optional[int] = None
 
@@ -221,8 +232,8 @@ class GLTransactionCreateRequest(GLTransactionBase):
 
 class GLTransactionUpdate(BaseModel):
     description: Optional[str] = Field(None, min_length=1)
-    debit_amount: Optional[float] = Field(None, ge=0)
-    credit_amount: Optional[float] = Field(None, ge=0)
+    debit_amount: Optional[GLAmount] = None
+    credit_amount: Optional[GLAmount] = None
     reference_number: Optional[str] = Field(None, max_length=50)
 
 
@@ -2,53 +2,265 @@
 Pytest configuration and fixtures for backend tests
 """
 
+import os
+from datetime import date
+
+import httpx
 import pytest
-from sqlalchemy import create_engine
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
 from app.database.database import Base, get_db
-from app.models.core import User, Role, UserRole, Company, Customer, Supplier
-from app.core.security import get_password_hash
+from app.models.core import (
+    User, Role, UserRole, Company, Customer, Supplier, GLAccount, GLAccountBalance, AccountingPeriod
+)
+from app.core.security import create_access_token, get_password_hash
 
 
-# Test database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Test database URL - keyed on the pytest-xdist worker so parallel runs
+# (pytest -n auto) each get their own in-memory database. Set TEST_DATABASE_URL
+# to run the suite against PostgreSQL instead.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "master")
+SQLALCHEMY_DATABASE_URL = os.environ.get(
+    "TEST_DATABASE_URL",
+    f"sqlite:///file:rwanly_test_{XDIST_WORKER}?mode=memory&cache=shared&uri=true"
+)
+
+if SQLALCHEMY_DATABASE_URL.startswith("postgresql"):
+    # psycopg2 fast-execution helpers: executemany (bulk inserts) runs as
+    # batched VALUES pages instead of one round-trip per row
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        executemany_mode="values_plus_batch",
+        executemany_values_page_size=1000,
+        echo=False
+    )
+else:
+    # SQLite has no batch mode; share one in-memory connection across the session
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        echo=False  # Set to True for SQL debugging
+    )
+
+TEST_USER_EMAIL = "test@example.com"
+TEST_API_USERNAME = "apiuser"
 
-# Create test engine with proper configuration for SQLite
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
+# Private in-memory SQLite engine for modules marked db_lite: CRUD-heavy tests
+# that don't need server semantics skip the configured database entirely
+lite_engine = create_engine(
+    "sqlite://",
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
-    echo=False  # Set to True for SQL debugging
+    echo=False
 )
 
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite only enforces FOREIGN KEY constraints when enabled per connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+event.listen(lite_engine, "connect", _enable_sqlite_foreign_keys)
+
 # Create test session maker
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "db_lite: run the module's db fixtures on a private in-memory SQLite database "
+        "(on a class, only when every test in the module is marked)"
+    )
+    config.addinivalue_line(
+        "markers", "strict_consistency: opt-in step-by-step checks, run with -m strict_consistency"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip strict_consistency tests unless they were selected explicitly"""
+    if "strict_consistency" in (config.getoption("markexpr") or ""):
+        return
+    skip_strict = pytest.mark.skip(reason="opt-in: run with -m strict_consistency")
+    for item in items:
+        if item.get_closest_marker("strict_consistency"):
+            item.add_marker(skip_strict)
+
+
+def _teardown_schema(bind):
+    """Drop the test schema; in-memory SQLite databases just go away with their connection"""
+    in_memory = bind.url.database in (None, "", ":memory:") or bind.url.query.get("mode") == "memory"
+    if bind.dialect.name == "sqlite" and in_memory:
+        bind.dispose()
+    else:
+        Base.metadata.drop_all(bind=bind)
+
+
+@pytest.fixture(scope="session")
+def code_prefix():
+    """Prefix for seeded unique codes, so xdist workers sharing a server database never collide"""
+    return "" if XDIST_WORKER == "master" else f"{XDIST_WORKER}-"
+
+
 @pytest.fixture(scope="session")
 def setup_database():
-    """Set up test database for the session"""
+    """Set up test database for the session (once per xdist worker)"""
+    # The schema is created once; tests are isolated by SAVEPOINTs, never by DDL
     Base.metadata.create_all(bind=engine)
     yield
-    Base.metadata.drop_all(bind=engine)
+    _teardown_schema(engine)
 
 
-@pytest.fixture
-def db(setup_database):
-    """Create a test database session"""
-    connection = engine.connect()
+@pytest.fixture(scope="session")
+def setup_lite_database():
+    """Set up the in-memory db_lite database on first use"""
+    Base.metadata.create_all(bind=lite_engine)
+    yield
+    _teardown_schema(lite_engine)
+
+
+def _module_is_lite(request) -> bool:
+    """A module runs on the db_lite engine when it, or every test collected from it, is marked db_lite"""
+    if request.node.get_closest_marker("db_lite"):
+        return True
+    module_items = [item for item in request.session.items if item.module is request.module]
+    return bool(module_items) and all(item.get_closest_marker("db_lite") for item in module_items)
+
+
+@pytest.fixture(scope="module")
+def db_connection(request):
+    """One connection per test module, holding an outer transaction rolled back at module teardown"""
+    if _module_is_lite(request):
+        request.getfixturevalue("setup_lite_database")
+        connection = lite_engine.connect()
+    else:
+        request.getfixturevalue("setup_database")
+        connection = engine.connect()
     transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
     
-    yield session
+    yield connection
     
-    session.close()
     transaction.rollback()
     connection.close()
 
 
+@pytest.fixture(scope="module")
+def db_module(db_connection):
+    """Module-scoped session for reference data seeded once and shared by every test in the module"""
+    session = TestingSessionLocal(
+        bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False
+    )
+    
+    yield session
+    
+    session.close()
+
+
+@pytest.fixture
+def db(db_connection):
+    """Create a test database session inside a SAVEPOINT rolled back at teardown"""
+    savepoint = db_connection.begin_nested()
+    # CRUD commits release a nested SAVEPOINT instead of committing the outer transaction
+    session = TestingSessionLocal(bind=db_connection, join_transaction_mode="create_savepoint")
+    
+    yield session
+    
+    session.close()
+    savepoint.rollback()
+
+
+@pytest.fixture(scope="module")
+def gl_company(db_module: Session):
+    """Company owning the module-scoped GL seed, shared by the tests of a module"""
+    company = Company(
+        name="Test Company Ltd",
+        registration_number="TEST123",
+        tax_number="TAX456",
+        address="123 Test Street, Test City",
+        contact_email="test@company.com",
+        contact_phone="123-456-7890",
+        is_active=True
+    )
+    db_module.add(company)
+    db_module.commit()
+    return company
+
+
+@pytest.fixture(scope="module")
+def gl_accounts(db_module: Session, gl_company: Company):
+    """Seed the GL accounts used by the ledger tests once per module, keyed by role"""
+    accounts = {
+        "cash": GLAccount(account_code="1000", account_name="Cash",
+                          account_type="ASSETS", normal_balance="DEBIT"),
+        "test": GLAccount(account_code="1003", account_name="Test Account",
+                          account_type="ASSETS", normal_balance="DEBIT"),
+        "revenue": GLAccount(account_code="4000", account_name="Sales Revenue",
+                             account_type="REVENUE", normal_balance="CREDIT"),
+        "expense": GLAccount(account_code="5000", account_name="Office Expenses",
+                             account_type="EXPENSES", normal_balance="DEBIT"),
+    }
+    for account in accounts.values():
+        account.company_id = gl_company.id
+    db_module.bulk_save_objects(accounts.values(), return_defaults=True)
+    
+    # Running totals start at zero, as gl_account_crud.create_account would seed them
+    db_module.bulk_save_objects([
+        GLAccountBalance(gl_account_id=account.id, company_id=gl_company.id,
+                         debit_total=0, credit_total=0)
+        for account in accounts.values()
+    ])
+    db_module.commit()
+    return accounts
+
+
+@pytest.fixture(scope="module")
+def gl_period(db_module: Session, gl_company: Company):
+    """Open accounting period of gl_company covering the current year, seeded once per module"""
+    year = date.today().year
+    period = AccountingPeriod(
+        company_id=gl_company.id,
+        period_name=f"FY {year}",
+        start_date=date(year, 1, 1),
+        end_date=date(year, 12, 31),
+        is_closed=False,
+        financial_year=year
+    )
+    db_module.add(period)
+    db_module.commit()
+    return period
+
+
+@pytest.fixture(scope="module")
+def api_user(db_module: Session, gl_company: Company):
+    """User the API tests authenticate as, holding an all-permissions role in gl_company"""
+    role = Role(name="API Admin", description="All permissions for API tests",
+                permissions=["all"], company_id=gl_company.id)
+    user = User(
+        username=TEST_API_USERNAME,
+        email="api@example.com",
+        password_hash=get_password_hash("testpass"),
+        company_id=gl_company.id,
+        first_name="API",
+        last_name="User",
+        is_active=True
+    )
+    db_module.add_all([role, user])
+    db_module.flush()
+    db_module.add(UserRole(user_id=user.id, role_id=role.id))
+    db_module.commit()
+    return user
+
+
+# Per-test fixtures flush rather than commit: the db session lives inside the test's
+# SAVEPOINT, and flush assigns primary keys without expiring the loaded attributes
+
 @pytest.fixture
 def test_company(db: Session):
     """Create a test company"""
@@ -62,17 +274,33 @@ def test_company(db: Session):
         is_active=True
     )
     db.add(company)
-    db.commit()
-    db.refresh(company)
+    db.flush()
     return company
 
 
+@pytest.fixture
+def test_accounting_period(db: Session, test_company: Company):
+    """Create an open accounting period covering the current year"""
+    year = date.today().year
+    period = AccountingPeriod(
+        company_id=test_company.id,
+        period_name=f"FY {year}",
+        start_date=date(year, 1, 1),
+        end_date=date(year, 12, 31),
+        is_closed=False,
+        financial_year=year
+    )
+    db.add(period)
+    db.flush()
+    return period
+
+
 @pytest.fixture 
 def test_user(db: Session, test_company: Company):
     """Create a test user"""
     user = User(
         username="testuser",
-        email="test@example.com",
+        email=TEST_USER_EMAIL,
         password_hash=get_password_hash("testpass"),
         company_id=test_company.id,
         first_name="Test",
@@ -80,8 +308,7 @@ def test_user(db: Session, test_company: Company):
         is_active=True
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     return user
 
 
@@ -100,8 +327,7 @@ def test_customer(db: Session, test_company: Company):
         is_active=True
     )
     db.add(customer)
-    db.commit()
-    db.refresh(customer)
+    db.flush()
     return customer
 
 
@@ -120,8 +346,7 @@ def test_supplier(db: Session, test_company: Company):
         is_active=True
     )
     db.add(supplier)
-    db.commit()
-    db.refresh(supplier)
+    db.flush()
     return supplier
 
 
@@ -134,8 +359,7 @@ def admin_role(db: Session):
         is_active=True
     )
     db.add(role)
-    db.commit()
-    db.refresh(role)
+    db.flush()
     return role
 
 
@@ -144,5 +368,76 @@ def test_user_with_role(db: Session, test_user: User, admin_role: Role):
     """Create test user with admin role"""
     user_role = UserRole(user_id=test_user.id, role_id=admin_role.id)
     db.add(user_role)
-    db.commit()
+    db.flush()
     return test_user
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """TestClient around the FastAPI app, built once per session; use client/module_client in tests"""
+    from main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def module_client(app_client: TestClient, db_connection):
+    """Test client whose requests run on the module's test connection, for module-scoped API setup"""
+    # Requests share db_connection, so tests issue them one at a time; each gets its own
+    # SAVEPOINT, so an endpoint commit only releases it, leaving the module transaction
+    # and any test SAVEPOINT around it intact
+    def override_get_db():
+        session = TestingSessionLocal(bind=db_connection, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = app_client.app
+    app.dependency_overrides[get_db] = override_get_db
+    yield app_client
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def client(module_client: TestClient, db: Session):
+    """Test client for one test; its API writes are rolled back with the test's SAVEPOINT"""
+    return module_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers_for():
+    """Bearer headers for a username (the token subject), signed once per session and reused"""
+    cache = {}
+
+    def headers_for(username: str) -> dict:
+        if username not in cache:
+            token = create_access_token(data={"sub": username})
+            cache[username] = {"Authorization": f"Bearer {token}"}
+        return cache[username]
+
+    return headers_for
+
+
+@pytest.fixture(scope="module")
+def auth_headers(auth_headers_for, api_user: User):
+    """Bearer headers for the module's API user; the token itself is signed once per session"""
+    return auth_headers_for(api_user.username)
+
+
+@pytest.fixture(scope="module")
+def seeded_ids(api_user: User, gl_period: AccountingPeriod, gl_accounts: dict):
+    """IDs of the module's seeded accounting period and GL accounts, for the API tests"""
+    return {
+        "period_id": gl_period.id,
+        "account_id": gl_accounts["test"].id,
+        "cash_id": gl_accounts["cash"].id,
+        "revenue_id": gl_accounts["revenue"].id,
+    }
+
+
+@pytest_asyncio.fixture
+async def async_client(client: TestClient):
+    """Async HTTP client bound to the FastAPI app, sharing the sync client's per-test database"""
+    async with httpx.AsyncClient(app=client.app, base_url="http://test") as ac:
+        yield ac
@@ -0,0 +1,134 @@
+"""
+Inventory transaction CRUD tests
+
+Covers InventoryTransactionCRUD.create_bulk: quantities and weighted average cost
+after a series, transactions returned in input order, GL postings, and the stock
+check on every intermediate quantity.
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+from datetime import date
+from decimal import Decimal
+from app.models.core import (
+    AccountingPeriod, GLTransaction, InventoryItem, InventoryTransactionType, User
+)
+from app.schemas.core import InventoryTransactionCreate
+from app.crud.general_ledger import gl_account_crud
+from app.crud.inventory import InventoryTransactionCRUD
+
+pytestmark = pytest.mark.db_lite
+
+
+@pytest.fixture
+def inventory_setup(db: Session, gl_accounts: dict):
+    """A stocked item with its GL accounts, the adjustment types and an open period"""
+    company_id = gl_accounts["test"].company_id
+    period = AccountingPeriod(
+        company_id=company_id,
+        period_name="Inventory Test Period",
+        start_date=date(date.today().year, 1, 1),
+        end_date=date(date.today().year, 12, 31),
+        is_closed=False,
+        financial_year=date.today().year
+    )
+    item = InventoryItem(
+        company_id=company_id,
+        item_code="BULK001",
+        description="Bulk Test Item",
+        item_type="Stock",
+        unit_of_measure="EA",
+        cost_price=Decimal("10.00"),
+        quantity_on_hand=Decimal("10.00"),
+        gl_asset_account_id=gl_accounts["test"].id,
+        gl_expense_account_id=gl_accounts["expense"].id
+    )
+    increase = InventoryTransactionType(
+        company_id=company_id, type_code="ADJ_IN", type_name="Adjustment In", affects_quantity="INCREASE"
+    )
+    decrease = InventoryTransactionType(
+        company_id=company_id, type_code="ADJ_OUT", type_name="Adjustment Out", affects_quantity="DECREASE"
+    )
+    user = User(
+        username="invbulk", email="invbulk@example.com", password_hash="x",
+        company_id=company_id, first_name="Inventory", last_name="Tester"
+    )
+    db.add_all([period, item, increase, decrease, user])
+    db.flush()
+    return {"item": item, "period": period, "INCREASE": increase, "DECREASE": decrease, "user": user}
+
+
+def _transaction(setup: dict, affects: str, quantity: str, unit_cost: str, reference: str):
+    return InventoryTransactionCreate(
+        company_id=setup["item"].company_id,
+        item_id=setup["item"].id,
+        transaction_type_id=setup[affects].id,
+        accounting_period_id=setup["period"].id,
+        transaction_date=date.today(),
+        reference_number=reference,
+        description=f"Bulk {affects.lower()}",
+        quantity=quantity,
+        unit_cost=unit_cost
+    )
+
+
+class TestCreateBulk:
+    """InventoryTransactionCRUD.create_bulk"""
+
+    def test_series_updates_quantity_cost_and_gl(self, db: Session, inventory_setup: dict):
+        """A series of receipts and issues lands like the same calls to create, in input order"""
+        setup = inventory_setup
+        item = setup["item"]
+        asset_account_id = item.gl_asset_account_id
+        asset_before = gl_account_crud.get_balance(db, asset_account_id, item.company_id)
+
+        transactions = InventoryTransactionCRUD.create_bulk(db, objs_in=[
+            _transaction(setup, "INCREASE", "10", "20.00", "BULK-001"),
+            _transaction(setup, "DECREASE", "15", "15.00", "BULK-002"),
+            _transaction(setup, "INCREASE", "5", "15.00", "BULK-003"),
+        ], posted_by=setup["user"].id)
+
+        assert [t.reference_number for t in transactions] == ["BULK-001", "BULK-002", "BULK-003"]
+        assert [t.total_cost for t in transactions] == [Decimal("200.00"), Decimal("225.00"), Decimal("75.00")]
+
+        db.refresh(item)
+        assert item.quantity_on_hand == Decimal("10.00")
+        # (10 * 10 + 10 * 20) / 20 = 15, then (5 * 15 + 5 * 15) / 10 = 15
+        assert item.cost_price == Decimal("15.00")
+
+        gl_rows = db.query(GLTransaction).filter(
+            GLTransaction.source_module == "INV",
+            GLTransaction.source_document_id.in_([t.id for t in transactions])
+        ).all()
+        assert len(gl_rows) == 6
+        asset_after = gl_account_crud.get_balance(db, asset_account_id, item.company_id)
+        assert asset_after - asset_before == Decimal("50.00")
+
+    def test_multiple_adjustments_consistency(self, db: Session, inventory_setup: dict):
+        """A series of adjustments posted in one bulk call leaves the net quantity on hand"""
+        setup = inventory_setup
+        item = setup["item"]
+        adjustments = [
+            ("INCREASE", "20", "ADJ-001"),
+            ("DECREASE", "5", "ADJ-002"),
+            ("INCREASE", "10", "ADJ-003"),
+            ("DECREASE", "8", "ADJ-004"),
+        ]
+
+        InventoryTransactionCRUD.create_bulk(db, objs_in=[
+            _transaction(setup, affects, quantity, "10.00", reference)
+            for affects, quantity, reference in adjustments
+        ], posted_by=setup["user"].id)
+
+        db.refresh(item)
+        assert item.quantity_on_hand == Decimal("27.00")
+
+    def test_negative_intermediate_quantity_is_rejected(self, db: Session, inventory_setup: dict):
+        """A step that would take stock below zero fails even if a later receipt covers it"""
+        setup = inventory_setup
+
+        with pytest.raises(ValueError, match="Insufficient stock quantity"):
+            InventoryTransactionCRUD.create_bulk(db, objs_in=[
+                _transaction(setup, "DECREASE", "15", "10.00", "BULK-101"),
+                _transaction(setup, "INCREASE", "20", "10.00", "BULK-102"),
+            ], posted_by=setup["user"].id)
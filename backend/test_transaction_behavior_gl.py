@@ -10,21 +10,31 @@ This test file validates:
 """
 
 import pytest
-from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from datetime import date, datetime
 from decimal import Decimal
 from app.models.core import GLAccount, GLTransaction, Company, User, AccountingPeriod
 from app.schemas.core import GLAccountCreate, GLTransactionCreate, AccountingPeriodCreate
-from app.crud.general_ledger import gl_account_crud, gl_transaction_crud
+from app.crud.general_ledger import gl_account_crud, gl_transaction_crud, ClosedPeriodError
 from app.crud.core import accounting_period_crud
 
+# The API tests for this module live in test_transaction_behavior_gl_api.py and run on
+# the configured test database; only the CRUD tests here use in-memory SQLite
 
+
+@pytest.fixture
+def test_company(gl_company: Company):
+    """Post as a user of the company that owns the module's GL accounts and period"""
+    return gl_company
+
+
+@pytest.mark.db_lite
 class TestJournalEntryBehavior:
     """Test Journal Entry (GL) Transaction & Document Processing Behavior"""
     
-    def test_create_balanced_journal_entry(self, db: Session, test_company: Company, 
-                                         test_user: User, test_accounting_period: AccountingPeriod):
+    def test_create_balanced_journal_entry(self, db: Session, gl_company: Company, 
+                                         test_user: User, gl_period: AccountingPeriod,
+                                         gl_accounts: dict):
         """
         Action: Create a multi-line journal entry (at least 2 lines) with equal debits and credits.
         Verification:
@@ -33,46 +43,33 @@ class TestJournalEntryBehavior:
         - GL account balances MUST update immediately.
         """
         
-        # Create GL accounts for the journal entry
-        cash_account = gl_account_crud.create_account(db, GLAccountCreate(
-            company_id=test_company.id,
-            account_code="1000",
-            account_name="Cash",
-            account_type="ASSETS",
-            normal_balance="DEBIT"
-        ))
-        
-        revenue_account = gl_account_crud.create_account(db, GLAccountCreate(
-            company_id=test_company.id,
-            account_code="4000", 
-            account_name="Sales Revenue",
-            account_type="REVENUE",
-            normal_balance="CREDIT"
-        ))
+        # Accounts are seeded once per module by the gl_accounts fixture
+        cash_account = gl_accounts["cash"]
+        revenue_account = gl_accounts["revenue"]
         
         # Create balanced journal entry (2 lines)
         journal_lines = [
             GLTransactionCreate(
-                company_id=test_company.id,
-                accounting_period_id=test_accounting_period.id,
+                company_id=gl_company.id,
+                accounting_period_id=gl_period.id,
                 gl_account_id=cash_account.id,
                 transaction_date=date.today(),
                 reference_number="JE001",
                 description="Cash receipt from sales",
-                debit_amount=1000.00,
-                credit_amount=0.00,
+                debit_amount=Decimal("1000.00"),
+                credit_amount=Decimal("0.00"),
                 posted_by=test_user.id,
                 source_module="JOURNAL_ENTRY"
             ),
             GLTransactionCreate(
-                company_id=test_company.id,
-                accounting_period_id=test_accounting_period.id,
+                company_id=gl_company.id,
+                accounting_period_id=gl_period.id,
                 gl_account_id=revenue_account.id,
                 transaction_date=date.today(),
                 reference_number="JE001",
                 description="Sales revenue earned",
-                debit_amount=0.00,
-                credit_amount=1000.00,
+                debit_amount=Decimal("0.00"),
+                credit_amount=Decimal("1000.00"),
                 posted_by=test_user.id,
                 source_module="JOURNAL_ENTRY"
             )
@@ -83,76 +80,55 @@ class TestJournalEntryBehavior:
         total_credits = sum(line.credit_amount for line in journal_lines)
         assert total_debits == total_credits, "Journal entry must be balanced"
         
-        # Post each line of the journal entry
-        posted_transactions = []
-        for line in journal_lines:
-            transaction = gl_transaction_crud.create_transaction(db, line)
-            posted_transactions.append(transaction)
+        # Post all lines of the journal entry in one batch
+        posted_transactions = gl_transaction_crud.create_transactions_bulk(db, journal_lines, commit=False)
+        for transaction in posted_transactions:
             assert transaction.id is not None, "Transaction must post successfully"
         
         # Verify both transactions were created
         assert len(posted_transactions) == 2, "Both journal entry lines must be posted"
         
-        # Verify GL account balances updated
-        cash_transactions = gl_transaction_crud.get_transactions(
-            db, test_company.id, account_id=cash_account.id
-        )
-        revenue_transactions = gl_transaction_crud.get_transactions(
-            db, test_company.id, account_id=revenue_account.id
-        )
-        
-        cash_balance = sum(t.debit_amount for t in cash_transactions) - sum(t.credit_amount for t in cash_transactions)
-        revenue_balance = sum(t.credit_amount for t in revenue_transactions) - sum(t.debit_amount for t in revenue_transactions)
+        # Verify GL account balances updated, both in one grouped query
+        balances = gl_transaction_crud.get_balances(db, gl_company.id, [cash_account.id, revenue_account.id])
         
-        assert cash_balance == 1000.00, "Cash account balance must update to 1000.00"
-        assert revenue_balance == 1000.00, "Revenue account balance must update to 1000.00"
+        assert balances[cash_account.id] == Decimal("1000.00"), "Cash account balance must update to 1000.00"
+        # Revenue has a credit normal balance
+        assert -balances[revenue_account.id] == Decimal("1000.00"), "Revenue account balance must update to 1000.00"
         
-    def test_unbalanced_journal_entry_prevention(self, db: Session, test_company: Company, 
-                                                test_user: User, test_accounting_period: AccountingPeriod):
+    def test_unbalanced_journal_entry_prevention(self, db: Session, gl_company: Company, 
+                                                test_user: User, gl_period: AccountingPeriod,
+                                                gl_accounts: dict):
         """
         Action: Test posting when debits != credits. The system MUST prevent posting.
         Verification: The system MUST prevent posting when debits don't equal credits.
         """
         
-        # Create GL accounts
-        cash_account = gl_account_crud.create_account(db, GLAccountCreate(
-            company_id=test_company.id,
-            account_code="1001",
-            account_name="Cash",
-            account_type="ASSETS",
-            normal_balance="DEBIT"
-        ))
-        
-        revenue_account = gl_account_crud.create_account(db, GLAccountCreate(
-            company_id=test_company.id,
-            account_code="4001",
-            account_name="Sales Revenue",
-            account_type="REVENUE", 
-            normal_balance="CREDIT"
-        ))
+        # Accounts are seeded once per module by the gl_accounts fixture
+        cash_account = gl_accounts["cash"]
+        revenue_account = gl_accounts["revenue"]
         
         # Create unbalanced journal entry lines (debits > credits)
         journal_lines = [
             GLTransactionCreate(
-                company_id=test_company.id,
-                accounting_period_id=test_accounting_period.id,
+                company_id=gl_company.id,
+                accounting_period_id=gl_period.id,
                 gl_account_id=cash_account.id,
                 transaction_date=date.today(),
                 reference_number="JE002",
                 description="Cash receipt",
-                debit_amount=1000.00,
-                credit_amount=0.00,
+                debit_amount=Decimal("1000.00"),
+                credit_amount=Decimal("0.00"),
                 posted_by=test_user.id
             ),
             GLTransactionCreate(
-                company_id=test_company.id,
-                accounting_period_id=test_accounting_period.id,
+                company_id=gl_company.id,
+                accounting_period_id=gl_period.id,
                 gl_account_id=revenue_account.id,
                 transaction_date=date.today(),
                 reference_number="JE002",
                 description="Sales revenue",
-                debit_amount=0.00,
-                credit_amount=750.00,  # Unbalanced - credits don't equal debits
+                debit_amount=Decimal("0.00"),
+                credit_amount=Decimal("750.00"),  # Unbalanced - credits don't equal debits
                 posted_by=test_user.id
             )
         ]
@@ -165,13 +141,13 @@ class TestJournalEntryBehavior:
         # In a real system, we would check the balance before posting
         # Here we simulate that the system should reject unbalanced entries
         balance_difference = abs(total_debits - total_credits)
-        assert balance_difference > 0.01, "System must detect unbalanced journal entries"
+        assert balance_difference > Decimal("0.01"), "System must detect unbalanced journal entries"
         
         # The system should not allow posting unbalanced entries
         # This would be enforced at the API/frontend level before individual transactions are created
         
-    def test_closed_period_posting_prevention(self, db: Session, test_company: Company, 
-                                            test_user: User):
+    def test_closed_period_posting_prevention(self, db: Session, gl_company: Company, 
+                                            test_user: User, gl_accounts: dict):
         """
         Action: Test posting into a closed accounting period. The system MUST block the transaction.
         Verification: The system MUST block transactions in closed periods.
@@ -179,296 +155,128 @@ class TestJournalEntryBehavior:
         
         # Create a closed accounting period
         closed_period_data = AccountingPeriodCreate(
-            company_id=test_company.id,
+            company_id=gl_company.id,
             period_name="Closed Period 2024",
             start_date=date(2024, 1, 1),
             end_date=date(2024, 12, 31),
             financial_year=2024,
             status="Closed"
         )
-        closed_period = accounting_period_crud.create_accounting_period(db, closed_period_data)
+        closed_period = accounting_period_crud.create(db, closed_period_data)
         
         # Manually close the period
         closed_period.is_closed = True
-        db.commit()
+        db.flush()
         
-        # Create GL account
-        cash_account = gl_account_crud.create_account(db, GLAccountCreate(
-            company_id=test_company.id,
-            account_code="1002",
-            account_name="Cash",
-            account_type="ASSETS",
-            normal_balance="DEBIT"
-        ))
+        # Accounts are seeded once per module by the gl_accounts fixture
+        cash_account = gl_accounts["cash"]
         
         # Attempt to create transaction in closed period
         transaction_data = GLTransactionCreate(
-            company_id=test_company.id,
+            company_id=gl_company.id,
             accounting_period_id=closed_period.id,
             gl_account_id=cash_account.id,
             transaction_date=date(2024, 6, 1),  # Date within closed period
             description="Transaction in closed period",
-            debit_amount=500.00,
-            credit_amount=0.00,
+            debit_amount=Decimal("500.00"),
+            credit_amount=Decimal("0.00"),
             posted_by=test_user.id
         )
         
-        # The system should prevent posting to closed periods
-        # This validation should happen at the API level
-        # For this test, we verify the period is closed
+        # The system must refuse to post into the closed period
         assert closed_period.is_closed == True, "Period must be closed for this test"
+        with pytest.raises(ClosedPeriodError):
+            gl_transaction_crud.create_transaction(db, transaction_data, commit=False)
         
-        # In production, this would raise an exception when attempted via API
-        # The CRUD layer might still allow it, but API should block it
-        
-    def test_gl_account_balance_updates(self, db: Session, test_company: Company, 
-                                      test_user: User, test_accounting_period: AccountingPeriod):
+    def test_gl_account_balance_updates(self, db: Session, gl_company: Company, 
+                                      test_user: User, gl_period: AccountingPeriod,
+                                      gl_accounts: dict):
         """
         Verify GL account balances MUST update immediately after posting.
         """
         
-        # Create GL account
-        expense_account = gl_account_crud.create_account(db, GLAccountCreate(
-            company_id=test_company.id,
-            account_code="5000",
-            account_name="Office Expenses",
-            account_type="EXPENSES",
-            normal_balance="DEBIT"
-        ))
+        # Accounts are seeded once per module by the gl_accounts fixture
+        expense_account = gl_accounts["expense"]
         
         # Initial balance should be zero
         initial_transactions = gl_transaction_crud.get_transactions(
-            db, test_company.id, account_id=expense_account.id
+            db, gl_company.id, account_id=expense_account.id
         )
         assert len(initial_transactions) == 0, "Account should start with no transactions"
         
         # Post first transaction
         transaction1 = gl_transaction_crud.create_transaction(db, GLTransactionCreate(
-            company_id=test_company.id,
-            accounting_period_id=test_accounting_period.id,
+            company_id=gl_company.id,
+            accounting_period_id=gl_period.id,
             gl_account_id=expense_account.id,
             transaction_date=date.today(),
             description="Office supplies purchase",
-            debit_amount=250.00,
-            credit_amount=0.00,
+            debit_amount=Decimal("250.00"),
+            credit_amount=Decimal("0.00"),
             posted_by=test_user.id
-        ))
+        ), commit=False)
         
         # Verify balance after first transaction
-        transactions_after_first = gl_transaction_crud.get_transactions(
-            db, test_company.id, account_id=expense_account.id
-        )
-        balance_after_first = sum(t.debit_amount for t in transactions_after_first) - sum(t.credit_amount for t in transactions_after_first)
-        assert balance_after_first == 250.00, "Balance must update immediately after first transaction"
+        balance_after_first = gl_account_crud.get_cached_balance(db, expense_account.id, gl_company.id)
+        assert balance_after_first == Decimal("250.00"), "Balance must update immediately after first transaction"
         
         # Post second transaction
         transaction2 = gl_transaction_crud.create_transaction(db, GLTransactionCreate(
-            company_id=test_company.id,
-            accounting_period_id=test_accounting_period.id,
+            company_id=gl_company.id,
+            accounting_period_id=gl_period.id,
             gl_account_id=expense_account.id,
             transaction_date=date.today(),
             description="Additional office expenses",
-            debit_amount=150.00,
-            credit_amount=0.00,
+            debit_amount=Decimal("150.00"),
+            credit_amount=Decimal("0.00"),
             posted_by=test_user.id
-        ))
+        ), commit=False)
         
         # Verify balance after second transaction
-        transactions_after_second = gl_transaction_crud.get_transactions(
-            db, test_company.id, account_id=expense_account.id
-        )
-        balance_after_second = sum(t.debit_amount for t in transactions_after_second) - sum(t.credit_amount for t in transactions_after_second)
-        assert balance_after_second == 400.00, "Balance must update immediately after second transaction"
+        balance_after_second = gl_account_crud.get_cached_balance(db, expense_account.id, gl_company.id)
+        assert balance_after_second == Decimal("400.00"), "Balance must update immediately after second transaction"
         
         # Verify both transactions exist
+        transactions_after_second = gl_transaction_crud.get_transactions(
+            db, gl_company.id, account_id=expense_account.id
+        )
         assert len(transactions_after_second) == 2, "Both transactions must be recorded"
         
-    def test_transaction_validation_rules(self, db: Session, test_company: Company, 
-                                        test_user: User, test_accounting_period: AccountingPeriod):
+        # Running totals must agree with the ledger
+        assert gl_account_crud.recompute_balance(db, expense_account.id, gl_company.id, commit=False) == balance_after_second, \
+            "Cached balance must reconcile with GL transactions"
+        
+    @pytest.mark.parametrize("debit,credit,raises", [
+        (Decimal("100.00"), Decimal("50.00"), ValueError),  # Both debit and credit - invalid
+        (Decimal("0.00"), Decimal("0.00"), ValueError),     # Neither debit nor credit - invalid
+        (Decimal("100.00"), Decimal("0.00"), None),         # Debit only - valid
+        (Decimal("0.00"), Decimal("75.00"), None),          # Credit only - valid
+    ])
+    def test_transaction_validation_rules(self, db: Session, gl_company: Company, 
+                                        test_user: User, gl_period: AccountingPeriod,
+                                        gl_accounts: dict, debit: Decimal, credit: Decimal, raises):
         """
-        Test various transaction validation rules that must be enforced.
+        Test the transaction validation rules that must be enforced.
+        A transaction must carry either a debit or a credit amount, but not both.
         """
         
-        # Create GL account
-        test_account = gl_account_crud.create_account(db, GLAccountCreate(
-            company_id=test_company.id,
-            account_code="1003",
-            account_name="Test Account",
-            account_type="ASSETS",
-            normal_balance="DEBIT"
-        ))
-        
-        # Test 1: Transaction with both debit and credit amounts (should fail)
-        with pytest.raises(ValueError, match="either a debit amount or credit amount"):
-            gl_transaction_crud.create_transaction(db, GLTransactionCreate(
-                company_id=test_company.id,
-                accounting_period_id=test_accounting_period.id,
-                gl_account_id=test_account.id,
-                transaction_date=date.today(),
-                description="Invalid transaction",
-                debit_amount=100.00,
-                credit_amount=50.00,  # Both debit and credit - invalid
-                posted_by=test_user.id
-            ))
-        
-        # Test 2: Transaction with neither debit nor credit amounts (should fail)
-        with pytest.raises(ValueError, match="either a debit amount or credit amount"):
-            gl_transaction_crud.create_transaction(db, GLTransactionCreate(
-                company_id=test_company.id,
-                accounting_period_id=test_accounting_period.id,
-                gl_account_id=test_account.id,
-                transaction_date=date.today(),
-                description="Invalid transaction",
-                debit_amount=0.00,
-                credit_amount=0.00,  # Neither debit nor credit - invalid
-                posted_by=test_user.id
-            ))
-        
-        # Test 3: Valid transaction with only debit amount (should pass)
-        valid_debit_transaction = gl_transaction_crud.create_transaction(db, GLTransactionCreate(
-            company_id=test_company.id,
-            accounting_period_id=test_accounting_period.id,
-            gl_account_id=test_account.id,
-            transaction_date=date.today(),
-            description="Valid debit transaction",
-            debit_amount=100.00,
-            credit_amount=0.00,
-            posted_by=test_user.id
-        ))
-        assert valid_debit_transaction.id is not None, "Valid debit transaction must be created"
-        assert valid_debit_transaction.debit_amount == 100.00, "Debit amount must be recorded correctly"
-        
-        # Test 4: Valid transaction with only credit amount (should pass)
-        valid_credit_transaction = gl_transaction_crud.create_transaction(db, GLTransactionCreate(
-            company_id=test_company.id,
-            accounting_period_id=test_accounting_period.id,
-            gl_account_id=test_account.id,
+        transaction_data = GLTransactionCreate(
+            company_id=gl_company.id,
+            accounting_period_id=gl_period.id,
+            gl_account_id=gl_accounts["test"].id,
             transaction_date=date.today(),
-            description="Valid credit transaction",
-            debit_amount=0.00,
-            credit_amount=75.00,
+            description="Validation rule transaction",
+            debit_amount=debit,
+            credit_amount=credit,
             posted_by=test_user.id
-        ))
-        assert valid_credit_transaction.id is not None, "Valid credit transaction must be created"
-        assert valid_credit_transaction.credit_amount == 75.00, "Credit amount must be recorded correctly"
-
-
-class TestJournalEntryAPI:
-    """Test Journal Entry API endpoints for Transaction & Document Processing Behavior"""
-    
-    def test_balanced_journal_entry_api(self, client: TestClient, auth_headers: dict):
-        """Test creating a balanced journal entry via API"""
-        
-        # Create GL accounts first
-        cash_account_data = {
-            "account_code": "1100",
-            "account_name": "Cash API Test",
-            "account_type": "ASSETS",
-            "normal_balance": "DEBIT"
-        }
-        cash_response = client.post("/api/gl/accounts", json=cash_account_data, headers=auth_headers)
-        assert cash_response.status_code == 201
-        cash_account_id = cash_response.json()["id"]
-        
-        revenue_account_data = {
-            "account_code": "4100", 
-            "account_name": "Revenue API Test",
-            "account_type": "REVENUE",
-            "normal_balance": "CREDIT"
-        }
-        revenue_response = client.post("/api/gl/accounts", json=revenue_account_data, headers=auth_headers)
-        assert revenue_response.status_code == 201
-        revenue_account_id = revenue_response.json()["id"]
-        
-        # Get accounting period
-        periods_response = client.get("/api/accounting-periods", headers=auth_headers)
-        periods = periods_response.json()
-        period_id = periods[0]["id"]
-        
-        # Create balanced journal entry lines
-        journal_lines = [
-            {
-                "accounting_period_id": period_id,
-                "gl_account_id": cash_account_id,
-                "transaction_date": "2025-05-29",
-                "reference_number": "JE-API-001",
-                "description": "Cash receipt from sales",
-                "debit_amount": 500.00,
-                "credit_amount": 0.00
-            },
-            {
-                "accounting_period_id": period_id,
-                "gl_account_id": revenue_account_id,
-                "transaction_date": "2025-05-29",
-                "reference_number": "JE-API-001",
-                "description": "Sales revenue earned",
-                "debit_amount": 0.00,
-                "credit_amount": 500.00
-            }
-        ]
-        
-        # Verify journal is balanced
-        total_debits = sum(line["debit_amount"] for line in journal_lines)
-        total_credits = sum(line["credit_amount"] for line in journal_lines)
-        assert total_debits == total_credits, "Journal entry must be balanced"
-        
-        # Post each line via API
-        posted_transactions = []
-        for line in journal_lines:
-            response = client.post("/api/gl/transactions", json=line, headers=auth_headers)
-            assert response.status_code == 201, f"Transaction must post successfully: {response.text}"
-            posted_transactions.append(response.json())
+        )
         
-        # Verify both transactions were created
-        assert len(posted_transactions) == 2, "Both journal entry lines must be posted"
+        if raises:
+            with pytest.raises(raises, match="either a debit amount or credit amount"):
+                gl_transaction_crud.create_transaction(db, transaction_data, commit=False)
+            return
         
-        # Verify transactions appear in listings
-        transactions_response = client.get("/api/gl/transactions", headers=auth_headers)
-        assert transactions_response.status_code == 200
-        all_transactions = transactions_response.json()
-        
-        # Find our journal entry transactions
-        je_transactions = [t for t in all_transactions if t.get("reference_number") == "JE-API-001"]
-        assert len(je_transactions) == 2, "Both journal entry transactions must appear in listing"
-        
-    def test_unbalanced_journal_prevention_api(self, client: TestClient, auth_headers: dict):
-        """Test that unbalanced journal entries are handled properly at API level"""
-        
-        # In practice, the frontend would validate balance before sending to API
-        # But we can test individual transactions to ensure they follow rules
-        
-        # Get existing account
-        accounts_response = client.get("/api/gl/accounts", headers=auth_headers)
-        accounts = accounts_response.json()
-        account_id = accounts[0]["id"]
-        
-        # Get accounting period
-        periods_response = client.get("/api/accounting-periods", headers=auth_headers)
-        periods = periods_response.json()
-        period_id = periods[0]["id"]
-        
-        # Test transaction with both debit and credit (should fail)
-        invalid_transaction = {
-            "accounting_period_id": period_id,
-            "gl_account_id": account_id,
-            "transaction_date": "2025-05-29",
-            "description": "Invalid transaction with both debit and credit",
-            "debit_amount": 100.00,
-            "credit_amount": 50.00  # Both amounts - invalid
-        }
-        
-        response = client.post("/api/gl/transactions", json=invalid_transaction, headers=auth_headers)
-        assert response.status_code == 400, "API must reject transactions with both debit and credit amounts"
-        
-        # Test transaction with no amounts (should fail)
-        empty_transaction = {
-            "accounting_period_id": period_id,
-            "gl_account_id": account_id,
-            "transaction_date": "2025-05-29",
-            "description": "Invalid transaction with no amounts",
-            "debit_amount": 0.00,
-            "credit_amount": 0.00
-        }
-        
-        response = client.post("/api/gl/transactions", json=empty_transaction, headers=auth_headers)
-        assert response.status_code == 400, "API must reject transactions with no debit or credit amounts"
+        transaction = gl_transaction_crud.create_transaction(db, transaction_data, commit=False)
+        assert transaction.id is not None, "Valid transaction must be created"
+        assert transaction.debit_amount == debit, "Debit amount must be recorded correctly"
+        assert transaction.credit_amount == credit, "Credit amount must be recorded correctly"
@@ -0,0 +1,114 @@
+"""
+Test Transaction & Document Processing Behavior - General Ledger API
+Tests the journal entry endpoints for the behaviors described in the CRUD_Testing_Checklist.md
+
+This test file validates:
+1. Balanced journal entries post via the batch endpoint
+2. Unbalanced or invalid lines are rejected by the API
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+class TestJournalEntryAPI:
+    """Test Journal Entry API endpoints for Transaction & Document Processing Behavior"""
+    
+    def test_balanced_journal_entry_api(self, client: TestClient, auth_headers: dict, seeded_ids: dict):
+        """Test creating a balanced journal entry via API"""
+        
+        # Create GL accounts first
+        cash_account_data = {
+            "account_code": "1100",
+            "account_name": "Cash API Test",
+            "account_type": "ASSETS",
+            "normal_balance": "DEBIT"
+        }
+        cash_response = client.post("/api/gl/accounts", json=cash_account_data, headers=auth_headers)
+        assert cash_response.status_code == 201
+        cash_account_id = cash_response.json()["id"]
+        
+        revenue_account_data = {
+            "account_code": "4100", 
+            "account_name": "Revenue API Test",
+            "account_type": "REVENUE",
+            "normal_balance": "CREDIT"
+        }
+        revenue_response = client.post("/api/gl/accounts", json=revenue_account_data, headers=auth_headers)
+        assert revenue_response.status_code == 201
+        revenue_account_id = revenue_response.json()["id"]
+        
+        # Accounting period seeded once per module
+        period_id = seeded_ids["period_id"]
+        
+        # Create balanced journal entry lines
+        journal_lines = [
+            {
+                "accounting_period_id": period_id,
+                "gl_account_id": cash_account_id,
+                "transaction_date": "2025-05-29",
+                "reference_number": "JE-API-001",
+                "description": "Cash receipt from sales",
+                "debit_amount": 500.00,
+                "credit_amount": 0.00
+            },
+            {
+                "accounting_period_id": period_id,
+                "gl_account_id": revenue_account_id,
+                "transaction_date": "2025-05-29",
+                "reference_number": "JE-API-001",
+                "description": "Sales revenue earned",
+                "debit_amount": 0.00,
+                "credit_amount": 500.00
+            }
+        ]
+        
+        # Verify journal is balanced
+        total_debits = sum(line["debit_amount"] for line in journal_lines)
+        total_credits = sum(line["credit_amount"] for line in journal_lines)
+        assert total_debits == total_credits, "Journal entry must be balanced"
+        
+        # Post the whole journal entry in one request
+        response = client.post("/api/gl/transactions/batch", json=journal_lines, headers=auth_headers)
+        assert response.status_code == 201, f"Transactions must post successfully: {response.text}"
+        posted_transactions = response.json()
+        
+        # Verify both transactions were created
+        assert len(posted_transactions) == 2, "Both journal entry lines must be posted"
+        
+        # Verify transactions appear in listings
+        transactions_response = client.get("/api/gl/transactions", headers=auth_headers)
+        assert transactions_response.status_code == 200
+        all_transactions = transactions_response.json()
+        
+        # Find our journal entry transactions
+        je_transactions = [t for t in all_transactions if t.get("reference_number") == "JE-API-001"]
+        assert len(je_transactions) == 2, "Both journal entry transactions must appear in listing"
+        
+    @pytest.mark.parametrize("debit,credit,status_code", [
+        (100.00, 50.00, 400),  # Both amounts - invalid
+        (0.00, 0.00, 400),     # No amounts - invalid
+    ])
+    def test_unbalanced_journal_prevention_api(self, client: TestClient, auth_headers: dict,
+                                               seeded_ids: dict, debit: float, credit: float, status_code: int):
+        """Test that unbalanced journal entries are handled properly at API level"""
+        
+        # In practice, the frontend would validate balance before sending to API
+        # But we can test individual transactions to ensure they follow rules
+        
+        # Existing account and period, seeded once per module
+        account_id = seeded_ids["account_id"]
+        period_id = seeded_ids["period_id"]
+        
+        invalid_transaction = {
+            "accounting_period_id": period_id,
+            "gl_account_id": account_id,
+            "transaction_date": "2025-05-29",
+            "description": "Invalid transaction amounts",
+            "debit_amount": debit,
+            "credit_amount": credit
+        }
+        
+        response = client.post("/api/gl/transactions", json=invalid_transaction, headers=auth_headers)
+        assert response.status_code == status_code, \
+            "API must reject transactions unless exactly one of debit or credit is set"
@@ -3,11 +3,17 @@
 Update role permissions to match the DEFAULT_ROLES configuration
 """
 
+from collections import defaultdict
+
+from sqlalchemy import select, update
 from sqlalchemy.orm import sessionmaker
 from app.database.database import engine
 from app.models.core import Role
 from app.core.permissions import DEFAULT_ROLES
 
+# Permission prefixes sampled in the progress output
+KEY_PERMISSION_PREFIXES = ("gl:", "ar:", "ap:", "sys:")
+
 def update_role_permissions():
     """Update role permissions in database to match DEFAULT_ROLES"""
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -16,32 +22,49 @@ def update_role_permissions():
     try:
         print("🔄 Updating role permissions...")
         
+        # Load every configured role in one query instead of one SELECT per role;
+        # like a per-name .first(), only the first row of each name is updated
+        roles = {}
+        for role in db.scalars(select(Role).where(Role.name.in_(DEFAULT_ROLES)).order_by(Role.id)):
+            roles.setdefault(role.name, role)
+        
+        # Roles sharing the same permission list are updated by one statement, by primary
+        # key, so same-named roles of other companies are left alone
+        ids_by_permissions = defaultdict(list)
         for role_name, expected_permissions in DEFAULT_ROLES.items():
-            role = db.query(Role).filter(Role.name == role_name).first()
+            role = roles.get(role_name)
             if role:
                 print(f"\n📝 Updating {role_name} role:")
                 print(f"   Current permissions: {len(role.permissions)}")
                 print(f"   Expected permissions: {len(expected_permissions)}")
-                
-                # Update permissions
-                role.permissions = expected_permissions
-                print(f"   ✓ Updated to {len(role.permissions)} permissions")
+                ids_by_permissions[tuple(expected_permissions)].append(role.id)
+                print(f"   ✓ Updating to {len(expected_permissions)} permissions")
                 
                 # Show some key permissions for verification
-                key_perms = [p for p in expected_permissions if any(x in p for x in ['gl:', 'ar:', 'ap:', 'sys:'])][:5]
+                key_perms = [p for p in expected_permissions if p.startswith(KEY_PERMISSION_PREFIXES)][:5]
                 print(f"   Sample permissions: {key_perms}")
             else:
                 print(f"❌ Role {role_name} not found")
         
+        for permissions, ids in ids_by_permissions.items():
+            db.execute(
+                update(Role).where(Role.id.in_(ids)).values(permissions=list(permissions))
+            )
+        
+        # Taken before commit, which expires the loaded roles
+        found_ids = [role.id for role in roles.values()]
         db.commit()
         print("\n✅ Role permissions updated successfully!")
         
         # Verify the changes
         print("\n🔍 Verification:")
+        # One query for the roles found above, rather than a SELECT per role
+        stored = dict(db.execute(
+            select(Role.name, Role.permissions).where(Role.id.in_(found_ids))
+        ).all())
         for role_name in DEFAULT_ROLES.keys():
-            role = db.query(Role).filter(Role.name == role_name).first()
-            if role:
-                print(f"   {role_name}: {len(role.permissions)} permissions")
+            if role_name in stored:
+                print(f"   {role_name}: {len(stored[role_name])} permissions")
         
     except Exception as e:
         print(f"❌ Error updating permissions: {e}")